@@ -2,14 +2,17 @@
 import logging
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import Callable
+from typing import Any, Callable, Optional
 
+from cocotb.handle import ModifiableObject
 from cocotb.result import SimTimeoutError
 from cocotb.triggers import NextTimeStep, Timer, with_timeout
 from cocotb.utils import _get_log_time_scale, _get_simulator_precision, get_sim_time
 
 I3C_RSVD_BYTE: int = 0x7E
 FULL_SPEED: float = 12.5e6
+# Single-bit masks in the order bits are transferred on the bus (MSB first)
+BIT_MASKS: tuple[int, ...] = (0x80, 0x40, 0x20, 0x10, 0x08, 0x04, 0x02, 0x01)
 
 
 class I3cState(IntEnum):
@@ -77,14 +80,25 @@ def make_timer(period_ns: float, speed: float = FULL_SPEED) -> Timer:
 
 def calculate_tbit(value: int, inject_tbit_err: bool = False) -> bool:
     """Calculates odd-parity for `value` to be written by the controller after `value`."""
-    tbit = True
-    while value != 0:
-        if (value & 1) != 0:
-            tbit = not tbit
-        value >>= 1
+    tbit = not (value.bit_count() & 1)
     return not tbit if inject_tbit_err else tbit
 
 
+# T-Bit (odd parity) of every byte value, as returned by `calculate_tbit`
+TBIT_TABLE: tuple[int, ...] = tuple(int(calculate_tbit(b)) for b in range(256))
+
+
+def debug_output_setter(signal: Optional[ModifiableObject]) -> Callable[[Any], None]:
+    """
+    Returns a function that mirrors values on the `signal` debug output, or does nothing
+    if there is no such output. Models call this once at construction instead of checking
+    for the output on every update.
+    """
+    if signal is None:
+        return lambda _: None
+    return signal.setimmediatevalue
+
+
 def round_time_to_sim_precision(time, units="ns"):
     """Rounds up measured time to simulator precision for hold time checks."""
     return round(time, abs(_get_simulator_precision() - _get_log_time_scale(units)))
@@ -4,6 +4,7 @@ SPDX-License-Identifier: Apache-2.0
 """
 
 import logging
+from collections import defaultdict
 from enum import Enum
 from typing import Any, Callable, Iterable, Optional, TypeVar, Union
 
@@ -12,11 +13,13 @@ from cocotb.handle import ModifiableObject
 from cocotb.triggers import Event, FallingEdge, First, NextTimeStep, RisingEdge, Timer
 
 from .common import (
+    BIT_MASKS,
     I3C_RSVD_BYTE,
+    TBIT_TABLE,
     I3cControllerTimings,
     I3cState,
     I3cTargetResetAction,
-    calculate_tbit,
+    debug_output_setter,
     make_timer,
     report_config,
     with_timeout_event,
@@ -30,12 +33,21 @@ class I3cXferMode(Enum):
     LEGACY_I2C = 1
 
     @property
-    def name(self) -> str:
-        match self:
-            case I3cXferMode.PRIVATE:
-                return "Private"
-            case I3cXferMode.LEGACY_I2C:
-                return "Legacy I2C"
+    def display_name(self) -> str:
+        return _XFER_MODE_NAMES[self]
+
+
+_XFER_MODE_NAMES: dict[I3cXferMode, str] = {
+    I3cXferMode.PRIVATE: "Private",
+    I3cXferMode.LEGACY_I2C: "Legacy I2C",
+}
+
+# Defining bytes of the RSTACT CCC used to query reset timings
+_RESET_ACTION_TO_DEF_BYTE: dict[I3cTargetResetAction, int] = {
+    I3cTargetResetAction.RESET_PERIPHERAL_ONLY: 0x81,
+    I3cTargetResetAction.RESET_WHOLE_TARGET: 0x82,
+    I3cTargetResetAction.DEBUG_NETWORK_ADAPTER_RESET: 0x83,
+}
 
 
 class Target:
@@ -100,6 +112,7 @@ class I3cController:
         self.scl_i = scl_i
         self.scl_o = scl_o
         self.debug_state_o = debug_state_o
+        self._apply_state = debug_output_setter(debug_state_o)
         self.speed = speed
 
         self.silent = silent
@@ -123,6 +136,7 @@ class I3cController:
         self.tfree = make_timer(timings.tfree)
         self.tsco = make_timer(timings.tsco)
         self.tsu_pp = make_timer(timings.tsu_od)
+        self.tnoop = Timer(10, "ps")
 
         self.hold_data = False
 
@@ -156,6 +170,10 @@ class I3cController:
         self.max_ibi_data_len = 65536  # This is the max value that can be set.
 
     def log_info(self, *args):
+        """
+        Log at INFO level unless the controller is silent. Arguments are passed
+        %-style to the logger, so silent controllers skip formatting altogether.
+        """
         if self.silent:
             return
         self.log.info(*args)
@@ -172,11 +190,14 @@ class I3cController:
     def remaining_tlow(self) -> Timer:
         return self.tdig_l if not self.hold_data else self.tdig_l_minus_thd
 
+    @property
+    def data_hold(self) -> Timer:
+        return self.thd if self.hold_data else self.tnoop
+
     @_state.setter
     def _state(self, value: I3cState) -> None:
         self._state_ = value
-        if self.debug_state_o is not None:
-            self.debug_state_o.setimmediatevalue(value)
+        self._apply_state(value)
 
     @property
     def scl(self) -> Any:
@@ -243,12 +264,6 @@ class I3cController:
             return
         self.monitor_enable.set()
 
-    async def _hold_data(self):
-        if self.hold_data:
-            await self.thd
-        else:
-            await Timer(10, "ps")
-
     async def check_start(self):
         if not (self.sda and self.scl):
             return None
@@ -277,10 +292,8 @@ class I3cController:
         def_bytes: Iterable[tuple[int, _T]], merge: bool = True
     ) -> Iterable[tuple[_T, list[int]]]:
         if merge:
-            merged: dict[_T, list[int]] = {}
+            merged: dict[_T, list[int]] = defaultdict(list)
             for address, def_byte in def_bytes:
-                if merged.get(def_byte) is None:
-                    merged[def_byte] = []
                 merged[def_byte].append(address)
 
             for def_byte, addresses in merged.items():
@@ -325,7 +338,7 @@ class I3cController:
 
         if pull_scl_low:
             self.scl = 0
-        await self._hold_data()
+        await self.data_hold
         self.sda = 0
         await self.remaining_tlow
         self.scl = 1
@@ -428,11 +441,11 @@ class I3cController:
                 for reset_action, addresses in I3cController._ccc_addresses_for_def_byte(
                     def_bytes=reset_actions, merge=merge_ccc_actions
                 ):
-                    print(f"Reset action {reset_action} for {addresses}")
+                    self.log_info("Reset action %s for %s", reset_action, addresses)
                     await self.i3c_ccc_write(
                         ccc=0x9A,
                         defining_byte=reset_action,
-                        directed_data=map(lambda addr: (addr, []), addresses),
+                        directed_data=tuple((addr, ()) for addr in addresses),
                         stop=False,
                     )
                     last_ccc = "direct"
@@ -440,17 +453,11 @@ class I3cController:
         queries: list[tuple[int, int]] = []
 
         def add_timing_query_for_reset_action(addr: int, action: I3cTargetResetAction):
-            match action:
-                case I3cTargetResetAction.NO_RESET:
-                    pass
-                case I3cTargetResetAction.RESET_PERIPHERAL_ONLY:
-                    queries.append((addr, 0x81))
-                case I3cTargetResetAction.RESET_WHOLE_TARGET:
-                    queries.append((addr, 0x82))
-                case I3cTargetResetAction.DEBUG_NETWORK_ADAPTER_RESET:
-                    queries.append((addr, 0x83))
-                case _:
-                    raise RuntimeError("Unsupported reset action for timing query: " f"`{action}`")
+            def_byte = _RESET_ACTION_TO_DEF_BYTE.get(action)
+            if def_byte is not None:
+                queries.append((addr, def_byte))
+            elif action != I3cTargetResetAction.NO_RESET:
+                raise RuntimeError("Unsupported reset action for timing query: " f"`{action}`")
 
         # Prepare RSTACT queries
 
@@ -465,10 +472,8 @@ class I3cController:
                 for addr, action in reset_actions:
                     add_timing_query_for_reset_action(addr, action)
             case _, _:  # Assume Iterable
-                addr_actions: dict[int, list[I3cTargetResetAction]] = {}
+                addr_actions: dict[int, list[I3cTargetResetAction]] = defaultdict(list)
                 for address, action in reset_actions:
-                    if addr_actions.get(address) is None:
-                        addr_actions[address] = []
                     addr_actions[address].append(action)
 
                 for address in query_timings:
@@ -488,6 +493,11 @@ class I3cController:
         # Query and calculate reset time
 
         max_timing = 0
+        interpret_timing_ns: dict[int, Callable[[int], int]] = {
+            0x81: self.interpret_target_peripheral_reset_timing_ns,
+            0x82: self.interpret_target_whole_reset_timing_ns,
+            0x83: self.interpret_target_net_adapter_reset_timing_ns,
+        }
         # TODO: expand semantics of i3c_ccc_read to allow querying multiple addresses
         # within a single CCC
         for address, def_byte in queries:
@@ -498,14 +508,7 @@ class I3cController:
 
             last_ccc = "direct"
 
-            timing_ns = 0
-            match def_byte:
-                case 0x81:
-                    timing_ns = self.interpret_target_peripheral_reset_timing_ns(timing_v)
-                case 0x82:
-                    timing_ns = self.interpret_target_whole_reset_timing_ns(timing_v)
-                case 0x83:
-                    timing_ns = self.interpret_target_net_adapter_reset_timing_ns(timing_v)
+            timing_ns = interpret_timing_ns[def_byte](timing_v)
             if timing_ns > max_timing:
                 max_timing = timing_ns
 
@@ -532,7 +535,7 @@ class I3cController:
             self.send_start()
 
         self.scl = 0
-        await self._hold_data()
+        await self.data_hold
         self.sda = bool(b)
         await self.remaining_tlow
         self.scl = 1
@@ -544,7 +547,7 @@ class I3cController:
             self.send_start()
 
         self.scl = 0
-        await self._hold_data()
+        await self.data_hold
         self.sda = 1
         await self.remaining_tlow
         if self.sda_i is None:
@@ -578,16 +581,17 @@ class I3cController:
 
     async def send_byte(self, b: int, addr: bool = False) -> bool:
         self._state = I3cState.ADDR if addr else I3cState.DATA_WR
-        for i in range(8):
-            await self.send_bit(b & (1 << 7 - i))
+        for mask in BIT_MASKS:
+            await self.send_bit(b & mask)
         self._state = I3cState.ACK
         return await self.recv_bit_od()
 
     async def recv_byte(self, send_ack: bool) -> int:
         b = 0
         self._state = I3cState.DATA_RD
-        for _ in range(8):
-            b = (b << 1) | await self.recv_bit()
+        for mask in BIT_MASKS:
+            if await self.recv_bit():
+                b |= mask
         self._state = I3cState.ACK
         # ACK is indicated by pulling SDA low
         ack = not send_ack
@@ -595,13 +599,13 @@ class I3cController:
         return b
 
     async def send_byte_tbit(self, b: int, inject_tbit_err: bool = False) -> None:
-        self.log_info(f"Controller:::Send byte {b}")
+        self.log_info("Controller:::Send byte %d", b)
         self._state = I3cState.DATA_WR
-        for i in range(8):
-            await self.send_bit(bool(b & (1 << (7 - i))))
+        for mask in BIT_MASKS:
+            await self.send_bit(b & mask)
         # Send T-Bit
         self._state = I3cState.TBIT_WR
-        await self.send_bit(calculate_tbit(b, inject_tbit_err))
+        await self.send_bit(TBIT_TABLE[b] ^ inject_tbit_err)
 
     async def tbit_eod(self, request_end: bool) -> bool:
         self.scl = 0
@@ -628,8 +632,9 @@ class I3cController:
     async def recv_byte_t_bit(self, stop: bool) -> tuple[int, bool]:
         b = 0
         self._state = I3cState.DATA_RD
-        for _ in range(8):
-            b = (b << 1) | (1 if await self.recv_bit() else 0)
+        for mask in BIT_MASKS:
+            if await self.recv_bit():
+                b |= mask
         self._state = I3cState.TBIT_RD
         tgt_eod = await self.tbit_eod(request_end=stop)
         return (b, tgt_eod | stop)
@@ -666,19 +671,19 @@ class I3cController:
     ) -> None:
         """I3C Private Write transfer"""
         await self.take_bus_control()
-        self.log_info(f"I3C: Write data ({mode.name}) {data} @ {hex(addr)}")
+        self.log_info("I3C: Write data (%s) %s @ 0x%x", mode.display_name, data, addr)
         await self.send_start()
         await self.write_addr_header(I3C_RSVD_BYTE)
         await self.send_start()
         await self.write_addr_header(addr)
 
-        for i, d in enumerate(data):
+        for d in data:
             match mode:
                 case I3cXferMode.PRIVATE:
                     await self.send_byte_tbit(d, inject_tbit_err)
                 case I3cXferMode.LEGACY_I2C:
                     await self.send_byte(d)
-            self.log_info(f"I3C: wrote byte {hex(d)}, idx={i}")
+            self.log_info("I3C: wrote byte 0x%x", d)
 
         if stop:
             await self.send_stop()
@@ -691,7 +696,7 @@ class I3cController:
         """I3C Private Read transfer"""
         await self.take_bus_control()
         data = bytearray()
-        self.log_info(f"I3C: Read data ({mode.name}) @ {hex(addr)}")
+        self.log_info("I3C: Read data (%s) @ 0x%x", mode.display_name, addr)
 
         await self.send_start()
         await self.write_addr_header(I3C_RSVD_BYTE)
@@ -724,9 +729,9 @@ class I3cController:
 
         log_data = broadcast_data if is_broadcast else directed_data
         if is_broadcast:
-            self.log_info(f"I3C: CCC {hex(ccc)} WR (Broadcast): {log_data}")
+            self.log_info("I3C: CCC 0x%x WR (Broadcast): %s", ccc, log_data)
         else:
-            self.log_info(f"I3C: CCC {hex(ccc)} WR (Directed): {log_data}")
+            self.log_info("I3C: CCC 0x%x WR (Directed): %s", ccc, log_data)
 
         acks = []
 
@@ -773,7 +778,7 @@ class I3cController:
 
         await self.take_bus_control()
         astr = " ".join([hex(a) for a in addr])
-        self.log_info(f"I3C: CCC {hex(ccc)} RD (Directed @ {astr})")
+        self.log_info("I3C: CCC 0x%x RD (Directed @ %s)", ccc, astr)
         responses = []
 
         await self.send_start()
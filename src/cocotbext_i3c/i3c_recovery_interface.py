@@ -10,6 +10,19 @@ from .common import I3C_RSVD_BYTE
 from .i3c_controller import I3cController
 
 
+def _pec_lookup_table(polynomial: int) -> tuple[int, ...]:
+    """
+    Returns a byte-wise (Sarwate) lookup table for a non-reflected 8-bit CRC
+    """
+    table = []
+    for i in range(256):
+        c = i
+        for _ in range(8):
+            c = ((c << 1) ^ polynomial if c & 0x80 else c << 1) & 0xFF
+        table.append(c)
+    return tuple(table)
+
+
 class I3cRecoveryException(RuntimeError):
     """
     A generic recovery-related exception class
@@ -24,8 +37,8 @@ class I3cRecoveryInterface:
     """
 
     # PEC checksum calculator config
-    # This should be equivalent to crc.CCIT8 but is left as explicit config
-    # for possible changes.
+    # This should be equivalent to crc.CCIT8. `PEC_TABLE` is built from the polynomial
+    # alone, so only plain CRC-8 configurations are supported.
     CRC_CONFIG = crc.Configuration(
         width=8,
         polynomial=0x7,
@@ -34,6 +47,14 @@ class I3cRecoveryInterface:
         reverse_input=False,
         reverse_output=False,
     )
+    assert CRC_CONFIG.width == 8, "PEC lookup table requires an 8-bit CRC"
+    assert (
+        CRC_CONFIG.init_value == 0 and CRC_CONFIG.final_xor_value == 0
+    ), "PEC lookup table requires zero initial and final XOR values"
+    assert not (
+        CRC_CONFIG.reverse_input or CRC_CONFIG.reverse_output
+    ), "PEC lookup table does not support reflected CRCs"
+    PEC_TABLE = _pec_lookup_table(CRC_CONFIG.polynomial)
 
     # Command codes. As per OCP recovery spec
     class Command:
@@ -57,18 +78,26 @@ class I3cRecoveryInterface:
         self.log.setLevel("DEBUG")
         self.controller = controller
 
-        # Initialize PEC calculator
-        self.pec_calc = crc.Calculator(self.CRC_CONFIG, optimized=True)
+    @classmethod
+    def _pec(cls, addr_header, xfer):
+        """
+        Computes PEC checksum of `xfer` preceded by the `addr_header` byte
+        """
+        table = cls.PEC_TABLE
+        # The checksum of the address header alone is a single table entry
+        pec = table[addr_header]
+        for b in xfer:
+            pec = table[pec ^ b]
+        return pec
 
     @staticmethod
     def _randomize_pec(pec):
         """
         Returns a random value for PEC checksum not equal to the given one
         """
-        while True:
-            r = random.randint(0, 255)
-            if r != pec:
-                return r
+        # Draw from the 255 values other than `pec` by skipping over it
+        r = random.randrange(255)
+        return r + (r >= pec)
 
     async def _i3c_recovery_read(self, address):
         """
@@ -94,15 +123,20 @@ class I3cRecoveryInterface:
             self.controller.give_bus_control()
             return None, None
 
+        # Reference PEC checksum, updated as the bytes arrive
+        pec_table = self.PEC_TABLE
+        pec = pec_table[(address << 1) | 1]
+
         # Begin reception
         try:
 
             # Read length
-            len_bytes = []
+            len_bytes = bytearray(2)
             for i in range(2):
                 byte, stop = await self.controller.recv_byte_t_bit(stop=False)
-                len_bytes.append(byte)
-                self.log.debug(f"Recovery Rx: byte[{i}]: 0x{byte:02X} (stop={int(stop)})")
+                len_bytes[i] = byte
+                pec = pec_table[pec ^ byte]
+                self.log.debug("Recovery Rx: byte[%d]: 0x%02X (stop=%d)", i, byte, stop)
 
                 # Length is mandatory. If the transfer gets terminated raise an
                 # exception.
@@ -110,15 +144,16 @@ class I3cRecoveryInterface:
                     self.log.error(f"Target requested stop at byte {i}")
                     raise I3cRecoveryException
 
-            length = (len_bytes[1] << 8) | len_bytes[0]
-            self.log.debug(f"Recovery Rx: Payload length is {length}B")
+            length = int.from_bytes(len_bytes, "little")
+            self.log.debug("Recovery Rx: Payload length is %dB", length)
 
             # Read data. Raise an exception in case of an unexpected stop
-            data = []
+            data = bytearray()
             for i in range(length):
                 byte, stop = await self.controller.recv_byte_t_bit(stop=False)
                 data.append(byte)
-                self.log.debug(f"Recovery Rx: byte[{i + 2}]: 0x{byte:02X} (stop={int(stop)})")
+                pec = pec_table[pec ^ byte]
+                self.log.debug("Recovery Rx: byte[%d]: 0x%02X (stop=%d)", i + 2, byte, stop)
 
                 if stop:
                     self.log.error(f"Target requested stop at byte {i + 2}")
@@ -130,19 +165,19 @@ class I3cRecoveryInterface:
                 self.log.error("Target wishes to transfer more data after PEC")
                 raise I3cRecoveryException
 
-        # In case of a protocol error wait some time and then re-throw
+        # In case of a protocol error terminate the transfer right away, release
+        # the bus, wait some time and then re-throw
         except I3cRecoveryException:
+            await self.controller.send_stop()
+            self.controller.give_bus_control()
             await Timer(1, "us")
             raise
 
         await self.controller.send_stop()
         self.controller.give_bus_control()
 
-        # Compute reference PEC checksum
-        pec_calc = int(self.pec_calc.checksum(bytes([(address << 1) | 1] + len_bytes + data)))
-
         # Return the data and received PEC validity
-        return data, (pec_recv == pec_calc)
+        return data, (pec_recv == pec)
 
     async def command_write(self, address, command, data=None, force_pec_error=False):
         """
@@ -153,17 +188,13 @@ class I3cRecoveryInterface:
             data = []
 
         # Header
-        xfer = [
-            command,
-            len(data) & 0xFF,
-            (len(data) >> 8) & 0xFF,
-        ]
+        xfer = bytearray((command, len(data) & 0xFF, (len(data) >> 8) & 0xFF))
 
         # Data
         xfer.extend(data)
 
         # Compute PEC
-        pec = int(self.pec_calc.checksum(bytes([address << 1] + xfer)))
+        pec = self._pec(address << 1, xfer)
 
         # Inject incorrect PEC
         if force_pec_error:
@@ -180,10 +211,10 @@ class I3cRecoveryInterface:
         """
 
         # Header
-        xfer = [command]
+        xfer = bytearray((command,))
 
         # Compute PEC
-        pec = int(self.pec_calc.checksum(bytes([address << 1] + xfer)))
+        pec = self._pec(address << 1, xfer)
 
         # Inject incorrect PEC
         if force_pec_error:
@@ -1,6 +1,6 @@
 import logging
 from enum import IntEnum
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 import cocotb
 from cocotb.handle import ModifiableObject
@@ -13,17 +13,18 @@ from cocotb.triggers import (
     NextTimeStep,
     ReadOnly,
     RisingEdge,
-    with_timeout,
 )
 
 from .common import (
+    BIT_MASKS,
     FULL_SPEED,
     I3C_RSVD_BYTE,
+    TBIT_TABLE,
     I3cState,
     I3cTargetTimings,
-    calculate_tbit,
     check_hold,
     check_in_time,
+    debug_output_setter,
     make_timer,
     report_config,
     with_timeout_event,
@@ -45,13 +46,14 @@ class I3cHeader(IntEnum):
 
 class I3CMemory:
     """
-    Simple memory model that consists of an int array and read / write pointers.
+    Simple memory model that consists of a byte array and read / write pointers.
     Since I3C has no memory address to direct the read / write requests to, the
-    memory serves as a memory buffer.
+    memory serves as a memory buffer. The memory `size` must be a power of 2.
 
     The `_read_mem` and `_write_mem` methods are mostly for the testing purposes -
     to read / write to the memory without the need to engage the target into private
-    read / write operations.
+    read / write operations. The target itself moves data one byte at a time through
+    `read_one` / `write_one`, which skip the list handling of `read` / `write`.
 
     * TODO: Add the condition upon which the target should terminate / NACK
             the incoming requests. This can be treating the following memory model
@@ -61,7 +63,10 @@ class I3CMemory:
 
     def __init__(self, log: logging.Logger, size: int = 256) -> None:
         self.log = log
+        # Pointers wrap around with a bitmask, which requires a power-of-two size
+        assert size > 0 and size & (size - 1) == 0, f"Memory size must be a power of 2: {size}"
         self.size = size
+        self._ptr_mask = size - 1
         self.clear()
 
     def is_in_bound(self, address: int) -> None:
@@ -70,35 +75,57 @@ class I3CMemory:
 
     def _read_mem(self, address: int, length: int) -> list[int]:
         self.is_in_bound(address)
-        data = self._mem[address : address + length]
-        self.read_ptr = (self.read_ptr + length) % self.size
+        data = list(self._mem[address : address + length])
+        self.read_ptr = (self.read_ptr + length) & self._ptr_mask
         return data
 
-    def _write_mem(self, address: int, data: list[int], length: int) -> None:
+    def _write_mem(
+        self, address: int, data: Union[list[int], bytes, bytearray, memoryview], length: int
+    ) -> None:
         self.is_in_bound(address)
-        for i in range(length):
-            self._mem[address + i] = data[i]
-        self.write_ptr = (self.write_ptr + length) % self.size
+        assert (
+            address + length <= self.size
+        ), f"Write of {length} bytes at {address} exceeds memory size {self.size}"
+        assert len(data) >= length, f"Write of {length} bytes given only {len(data)} bytes of data"
+        # Bytes-like data is copied straight from its buffer, lists are packed first
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data[:length])
+        # Assigning through a memoryview rejects writes past the end of memory
+        # instead of resizing the underlying bytearray
+        memoryview(self._mem)[address : address + length] = memoryview(data)[:length]
+        self.write_ptr = (self.write_ptr + length) & self._ptr_mask
 
     def read(self, length: int = 1) -> list[int]:
         data = self._read_mem(self.read_ptr, length)
-        self.log.debug(f"TARGET:::Performing read at {self.read_ptr}, data: {data}")
+        self.log.debug("TARGET:::Performing read at %d, data: %s", self.read_ptr, data)
         return data
 
     def write(self, data: list[int], length: int = 1) -> None:
-        self.log.debug(f"TARGET:::Performing write at {self.write_ptr}, data: {data}")
+        self.log.debug("TARGET:::Performing write at %d, data: %s", self.write_ptr, data)
         self._write_mem(self.write_ptr, data, length)
 
+    def read_one(self) -> int:
+        """Reads a single byte at the read pointer."""
+        byte = self._mem[self.read_ptr]
+        self.log.debug("TARGET:::Performing read at %d, data: %d", self.read_ptr, byte)
+        self.read_ptr = (self.read_ptr + 1) & self._ptr_mask
+        return byte
+
+    def write_one(self, byte: int) -> None:
+        """Writes a single byte at the write pointer."""
+        self.log.debug("TARGET:::Performing write at %d, data: %d", self.write_ptr, byte)
+        self._mem[self.write_ptr] = byte
+        self.write_ptr = (self.write_ptr + 1) & self._ptr_mask
+
     def clear(self):
-        self._mem = [0 for _ in range(self.size)]
+        self._mem = bytearray(self.size)
         self.read_ptr = 0
         self.write_ptr = 0
 
     def dump(self):
         for row in range(0, self.size, 20):
-            cells = [f"0x{_:02X}" for _ in self._mem[row : min(self.size, row + 20)]]
-            mem_row = ", ".join(cells)
-            self.log.info(mem_row)
+            cells = self._mem[row : row + 20].hex(" ").upper()
+            self.log.info("0x" + cells.replace(" ", ", 0x"))
 
 
 class I3CTarget:
@@ -161,10 +188,20 @@ class I3CTarget:
         self.scl_o = scl_o
         self.debug_state_o = debug_state_o
         self.debug_detected_header_o = debug_detected_header_o
+        self._apply_state = debug_output_setter(debug_state_o)
+        self._apply_header = debug_output_setter(debug_detected_header_o)
         self.speed = speed
         self.address = address
         self.max_read_length = max_read_length
 
+        # Edge triggers are awaited on every bit; create them once
+        self._scl_fall = FallingEdge(self.scl_i)
+        self._scl_rise = RisingEdge(self.scl_i)
+        self._scl_edge = Edge(self.scl_i)
+        self._sda_fall = FallingEdge(self.sda_i)
+        self._sda_rise = RisingEdge(self.sda_i)
+        self._sda_edge = Edge(self.sda_i)
+
         if timings is None:
             timings = I3cTargetTimings()
         self.timings = timings
@@ -187,10 +224,19 @@ class I3CTarget:
         self.state = I3cState.FREE
 
         self._header = I3cHeader.NONE
+        self._header_handlers = {
+            I3cHeader.RESERVED: self.handle_reserved,
+            I3cHeader.READ: self.handle_read,
+            I3cHeader.WRITE: self.handle_write,
+            I3cHeader.NON_APPLICABLE: self.handle_non_applicable,
+        }
         report_config(self.speed, timings, self.log.info)
 
-        self.monitor_enable = Event()
-        self.monitor_enable.set()
+        # Only toggled through `enable_monitor` / `disable_monitor`, which keep
+        # `_monitor_disable` as the complement bus observers can wake up on
+        self._monitor_enable = Event()
+        self._monitor_enable.set()
+        self._monitor_disable = Event()
         self.monitor_idle = Event()
         cocotb.start_soon(self._run())
 
@@ -208,8 +254,7 @@ class I3CTarget:
     @state.setter
     def state(self, value: I3cState) -> None:
         self._state_ = value
-        if self.debug_state_o is not None:
-            self.debug_state_o.setimmediatevalue(value)
+        self._apply_state(value)
 
     @property
     def scl(self) -> Any:
@@ -230,8 +275,17 @@ class I3CTarget:
     @header.setter
     def header(self, value: I3cHeader):
         self._header = value
-        if self.debug_detected_header_o:
-            self.debug_detected_header_o.setimmediatevalue(value)
+        self._apply_header(value)
+
+    @property
+    def address(self) -> Optional[int]:
+        return self._address
+
+    @address.setter
+    def address(self, value: Optional[int]) -> None:
+        self._address = value
+        # Address header with RnW bit set, as sent in IBIs
+        self._ibi_addr_byte = None if value is None else (value << 1) | 1
 
     async def check_start(self, repeated=True):
         if not (self.sda and self.scl):
@@ -262,20 +316,18 @@ class I3CTarget:
                 self.log.debug(e)
                 return None
 
-        sda_falling_edge = FallingEdge(self.sda_i)
-        scl_falling_edge = FallingEdge(self.scl_i)
-        result = None
-        monitor_enable = self.monitor_enable.is_set()
-        while (not monitor_enable or self.monitor_enable.is_set()) and result is None:
-            try:
-                result = await with_timeout(First(sda_falling_edge, scl_falling_edge), 1, "ns")
-            except SimTimeoutError:
-                self.log.debug("Waiting for SDA/SCL falling edge")
+        sda_falling_edge = self._sda_fall
+        scl_falling_edge = self._scl_fall
+        triggers = [sda_falling_edge, scl_falling_edge]
+        if self._monitor_enable.is_set():
+            # Give up waiting for START as soon as the monitor gets disabled
+            triggers.append(self._monitor_disable.wait())
+        result = await First(*triggers)
 
         if result != sda_falling_edge:
             return None
         try:
-            await check_in_time(FallingEdge(self.scl_i), tCAS)
+            await check_in_time(self._scl_fall, tCAS)
         except Exception:
             self.log.error("SCL did not fall in time")
             return None
@@ -283,8 +335,8 @@ class I3CTarget:
         # TODO: Add timing check, as the `sda` should be raised no earlier than `ds_od`
         # Followed by `scl` being raised no earlier than `tsu_od`
         if not repeated:
-            sda_rising_edge = RisingEdge(self.sda_i)
-            scl_rising_edge = RisingEdge(self.scl_i)
+            sda_rising_edge = self._sda_rise
+            scl_rising_edge = self._scl_rise
             result = await First(sda_rising_edge, scl_rising_edge)
             if result != sda_rising_edge:
                 return None
@@ -293,12 +345,12 @@ class I3CTarget:
         return next_state
 
     async def check_stop(self):
-        await RisingEdge(self.scl_i)
+        await self._scl_rise
         if self.sda:
             return None
 
-        rising_sda = RisingEdge(self.sda_i)
-        falling_scl = FallingEdge(self.scl_i)
+        rising_sda = self._sda_rise
+        falling_scl = self._scl_fall
 
         try:
             self.log.debug("Wait for rising_sda or falling_scl")
@@ -324,34 +376,37 @@ class I3CTarget:
         state = None
         assert self.bus_active
         await ReadOnly()
+        sda, scl = bool(self.sda_i.value), bool(self.scl_i.value)
 
-        if self.sda and self.scl:
+        if sda and scl:
             return await self.check_start(repeated=True)
 
-        if not self.sda and not self.scl:
+        if not sda and not scl:
             return await self.check_stop()
 
-        if not self.scl and self.sda:
+        if not scl and sda:
             state = await self.check_stop()
+            # The bus has moved on while waiting for STOP, sample it again
+            sda, scl = bool(self.sda_i.value), bool(self.scl_i.value)
 
-        if self.scl and not self.sda and not state:
+        if scl and not sda and not state:
             state = await self.check_start(repeated=True)
         return state
 
     async def recv_bit(self) -> bool:
         assert self.bus_active
         # Sample data on the rising clock edge
-        if not self.scl:
-            await RisingEdge(self.scl_i)
-        bit = bool(self.sda)
-        await FallingEdge(self.scl_i)
+        if not self.scl_i.value:
+            await self._scl_rise
+        bit = bool(self.sda_i.value)
+        await self._scl_fall
         return bit
 
     async def verify_parity(self, byte) -> bool:
         self.state = I3cState.TBIT_WR
-        expected_parity_bit = int(calculate_tbit(byte))
+        expected_parity_bit = TBIT_TABLE[byte]
 
-        await RisingEdge(self.scl_i)
+        await self._scl_rise
 
         parity_bit = bool(self.sda)
 
@@ -359,20 +414,33 @@ class I3CTarget:
             f"Received transition bit: {parity_bit} doesn't match given data: {hex(byte)}. "
             f"Expected {expected_parity_bit}."
         )
-        await FallingEdge(self.scl_i)
+        await self._scl_fall
 
     async def ack(self):
         self.state = I3cState.ACK
         if self.scl:
-            await FallingEdge(self.scl_i)
+            await self._scl_fall
         self.sda = 0
-        await FallingEdge(self.scl_i)
+        await self._scl_fall
         self.sda = 1
 
-    async def recv(self, bits_num=8) -> int:
-        b = 0
+    async def recv(self, bits_num=8, b=0) -> int:
+        """
+        Receives `bits_num` bits (MSB first) and shifts them into `b`.
+        The bit loops of `recv` and `send_byte` are inlined rather than awaiting
+        `recv_bit` / `send_bit`, which would start a coroutine per bit.
+        """
+        assert self.bus_active
+        sda_i = self.sda_i
+        # SCL is low after every bit, so it only has to be checked before the first one
+        scl = self.scl_i.value
         for _ in range(bits_num):
-            b = (b << 1) | await self.recv_bit()
+            # Sample data on the rising clock edge
+            if not scl:
+                await self._scl_rise
+            scl = 0
+            b = (b << 1) | bool(sda_i.value)
+            await self._scl_fall
         return b
 
     async def recv_byte(self, is_data: bool = True, ack=True, check_for_stop=False) -> int:
@@ -387,8 +455,7 @@ class I3CTarget:
                 s = 1
                 b = bool(self.sda)
         self.state = I3cState.DATA_WR
-        for _ in range(s, length):
-            b = (b << 1) | await self.recv_bit()
+        b = await self.recv(length - s, b)
 
         if is_data:
             await self.verify_parity(b)
@@ -400,26 +467,31 @@ class I3CTarget:
 
     async def send_bit(self, bit: bool):
         if self.scl:
-            await FallingEdge(self.scl_i)
+            await self._scl_fall
 
         self.sda = bool(bit)
 
-        await FallingEdge(self.scl_i)
+        await self._scl_fall
         # TODO: Ensure that the sent bit was propagated on the bus
         # assert self.sda_i.value == int(bit)
         self.sda = 1
 
     async def send_byte(self, byte: int, terminate: bool):
-        for i in range(8):
-            await self.send_bit(byte & (1 << 7 - i))
+        # SDA is not released between bits: the next bit (or the T-Bit below) is
+        # driven in the same time step as the falling SCL edge.
+        for mask in BIT_MASKS:
+            if self.scl:
+                await self._scl_fall
+            self.sda = bool(byte & mask)
+            await self._scl_fall
 
         self.state = I3cState.TBIT_RD
         if self.scl:
-            await FallingEdge(self.scl_i)
+            await self._scl_fall
 
         # Issue end of data if there's no more data to be send
         self.sda = not terminate
-        await RisingEdge(self.scl_i)
+        await self._scl_rise
         self.sda = 1
 
         # Wait for Sr or P if termination requested
@@ -437,7 +509,7 @@ class I3CTarget:
         addr_header = await self.recv(bits_num=8)
         addr, is_read = addr_header >> 1, addr_header & 0x1
 
-        self.log.info(f"TARGET:::Address: {hex(addr)} RnW: {is_read}")
+        self.log.info("TARGET:::Address: 0x%x RnW: %d", addr, is_read)
 
         if addr == I3C_RSVD_BYTE:
             assert self.header in [I3cHeader.NONE, I3cHeader.READ, I3cHeader.WRITE]
@@ -455,9 +527,9 @@ class I3CTarget:
         next_state = None
         while not next_state:
             self.state = I3cState.DATA_RD
-            data = self._mem.read()
+            byte = self._mem.read_one()
             tbit = self._mem.read_ptr < self._mem.write_ptr
-            next_state = await self.send_byte(data[0] & 0xFF, not tbit)
+            next_state = await self.send_byte(byte, not tbit)
         self.state = next_state
         return next_state
 
@@ -468,38 +540,35 @@ class I3CTarget:
             self.state = I3cState.DATA_WR
             data, next_state = await self.recv_byte(is_data=True, ack=False, check_for_stop=True)
             if next_state != I3cState.STOP:
-                self._mem.write([data & 0xFF])
+                self._mem.write_one(data & 0xFF)
         self.state = next_state
         return next_state
 
+    async def handle_reserved(self) -> I3cState:
+        """RESERVED header, await `Sr` or `P`"""
+        self.state = I3cState.AWAIT_SR_OR_P
+        next_state = None
+        while not next_state:
+            next_state = await self.check_start_or_stop()
+        return next_state
+
+    async def handle_non_applicable(self) -> I3cState:
+        """Transfer to another device or unhandled CCC, await `Sr` or `P`"""
+        next_state = None
+        while not next_state:
+            next_state = await self.check_start_or_stop()
+        self.header = I3cHeader.NONE
+        return next_state
+
     async def handle_message(self):
         await self.wait_header()
-        match self.header:
-            case I3cHeader.RESERVED:
-                self.state = I3cState.AWAIT_SR_OR_P
-                next_state = None
-                while not next_state:
-                    next_state = await self.check_start_or_stop()
-            case I3cHeader.READ:
-                next_state = await self.handle_read()
-            case I3cHeader.WRITE:
-                next_state = await self.handle_write()
-            case I3cHeader.NON_APPLICABLE:
-                next_state = None
-                while not next_state:
-                    next_state = await self.check_start_or_stop()
-                self.header = I3cHeader.NONE
-            case _:
-                raise Exception(
-                    f"Intercepted address header: {self.header}"
-                    "Expected one of:"[
-                        I3cHeader.RESERVED,
-                        I3cHeader.READ,
-                        I3cHeader.WRITE,
-                        I3cHeader.NON_APPLICABLE,
-                    ]
-                )
-        return next_state
+        handler = self._header_handlers.get(self.header)
+        if handler is None:
+            raise Exception(
+                f"Intercepted address header: {self.header}. "
+                f"Expected one of: {list(self._header_handlers)}"
+            )
+        return await handler()
 
     def clear_hdr_exit_flag(self):
         self.hdr_exit_detected = False
@@ -512,8 +581,8 @@ class I3CTarget:
                 continue
 
             for _ in range(4):
-                rising_scl = RisingEdge(self.scl_i)
-                falling_sda = FallingEdge(self.sda_i)
+                rising_scl = self._scl_rise
+                falling_sda = self._sda_fall
                 trigger = await First(rising_scl, falling_sda)
                 if trigger == rising_scl:
                     break
@@ -524,9 +593,9 @@ class I3CTarget:
             self.hdr_exit_detected = True
             self.log.info("Detected HDR Exit Pattern!")
 
-    async def send_ibi(self, mdb=None, data: bytearray = None):
+    async def send_ibi(self, mdb=None, data: Optional[Union[bytes, bytearray]] = None):
         # Disable bus monitor and wait for bus to enter idle state
-        self.monitor_enable.clear()
+        self.disable_monitor()
         if not self.monitor_idle.is_set():
             await self.monitor_idle.wait()
         assert not self.bus_active
@@ -535,19 +604,19 @@ class I3CTarget:
         self.sda = 0
 
         # For now expect IBI accept but the controller can also NACK
-        await FallingEdge(self.scl_i)
+        await self._scl_fall
         await self.tsu_od
 
         # Send address with RnW bit set to 1'b1
         terminate = mdb is None
-        next_state = await self.send_byte((self.address << 1) | 1, terminate=terminate)
+        next_state = await self.send_byte(self._ibi_addr_byte, terminate=terminate)
         if mdb is not None:
             next_state = await self.send_byte(mdb, terminate=not data)
 
-            while data:
-                value = data.pop(0)
-                terminate = not data
-                next_state = await self.send_byte(value, terminate=terminate)
+            if data:
+                last = len(data) - 1
+                for i, value in enumerate(data):
+                    next_state = await self.send_byte(value, terminate=i == last)
 
         self.state = next_state
         if self.state == I3cState.STOP:
@@ -556,16 +625,23 @@ class I3CTarget:
             self.header = I3cHeader.NONE
 
         # Finish IBI handling and re-enable bus monitor
-        self.monitor_enable.set()
+        self.enable_monitor()
+
+    def enable_monitor(self) -> None:
+        self._monitor_disable.clear()
+        self._monitor_enable.set()
+
+    def disable_monitor(self) -> None:
+        self._monitor_enable.clear()
+        self._monitor_disable.set()
 
     async def _run(self) -> None:
         while True:
             # Monitor is idle, it will check whether it is enabled before observing the bus
             self.monitor_idle.set()
-            if not self.monitor_enable.is_set():
+            if not self._monitor_enable.is_set():
                 self.log.debug("Monitor disabled, awaiting for external enable trigger")
-                await self.monitor_enable.wait()
-            self.monitor_enable.set()
+                await self._monitor_enable.wait()
 
             # From this moment monitor is busy and should not be interrupted
             self.monitor_idle.clear()
@@ -576,8 +652,8 @@ class I3CTarget:
                 self.state = next_state
             else:
                 await with_timeout_event(
-                    self.monitor_enable,
-                    First(Edge(self.sda_i), Edge(self.scl_i)),
+                    self._monitor_enable,
+                    First(self._sda_edge, self._scl_edge),
                     1,
                 )
 
@@ -1,55 +1,42 @@
 import cocotb
-from cocotb.triggers import Timer
+from cocotb.triggers import Timer, with_timeout
 from utils import I3cTestbench
 
 
-@cocotb.test()
-async def test_simple_ibi(dut):
+async def test_ibi(dut, ibi_payload, mdb=None, data=None):
     tgt_address = 0x55
     tb = I3cTestbench(dut, tgt_address)
 
     target = tb.i3c_controller.add_target(tgt_address)
-    target.set_bcr_fields(ibi_payload=False)
+    target.set_bcr_fields(ibi_payload=ibi_payload)
 
     await Timer(100, "ns")
-    await tb.i3c_target.send_ibi()
-    await Timer(100, "ns")
+    await tb.i3c_target.send_ibi(mdb=mdb, data=data)
+    # The controller reports the IBI once it has issued the STOP
+    recv_data = await with_timeout(tb.i3c_controller.wait_for_ibi(), 50, "us")
+
+    # The controller only receives the MDB and data if the BCR announces an IBI payload
+    expected = bytes([tgt_address])
+    if ibi_payload:
+        expected += bytes([mdb]) + (data or b"")
+    assert recv_data == expected, f"Expected IBI {expected.hex(' ')} but got {recv_data.hex(' ')}"
 
 
 @cocotb.test()
-async def test_simple_ibi_mdb(dut):
-    tgt_address = 0x55
-    tb = I3cTestbench(dut, tgt_address)
+async def test_simple_ibi(dut):
+    await test_ibi(dut, ibi_payload=False)
 
-    target = tb.i3c_controller.add_target(tgt_address)
-    target.set_bcr_fields(ibi_payload=True)
 
-    await Timer(100, "ns")
-    await tb.i3c_target.send_ibi(mdb=0xAB)
-    await Timer(100, "ns")
+@cocotb.test()
+async def test_simple_ibi_mdb(dut):
+    await test_ibi(dut, ibi_payload=True, mdb=0xAB)
 
 
 @cocotb.test()
 async def test_simple_ibi_data(dut):
-    tgt_address = 0x55
-    tb = I3cTestbench(dut, tgt_address)
-
-    target = tb.i3c_controller.add_target(tgt_address)
-    target.set_bcr_fields(ibi_payload=True)
-
-    await Timer(100, "ns")
-    await tb.i3c_target.send_ibi(mdb=0x19, data=bytearray([0x81, 0x20, 0x30, 0x40]))
-    await Timer(100, "ns")
+    await test_ibi(dut, ibi_payload=True, mdb=0x19, data=b"\x81\x20\x30\x40")
 
 
 @cocotb.test()
 async def test_simple_ibi_data_no_mdb(dut):
-    tgt_address = 0x55
-    tb = I3cTestbench(dut, tgt_address)
-
-    target = tb.i3c_controller.add_target(tgt_address)
-    target.set_bcr_fields(ibi_payload=False)
-
-    await Timer(100, "ns")
-    await tb.i3c_target.send_ibi(mdb=None, data=bytearray([0x01]))
-    await Timer(100, "ns")
+    await test_ibi(dut, ibi_payload=False, data=b"\x01")
@@ -5,7 +5,7 @@ Copyright (c) 2024 Antmicro <www.antmicro.com>
 SPDX-License-Identifier: Apache-2.0
 """
 
-from random import randint
+from random import randbytes
 
 import cocotb
 from cocotb.triggers import Timer
@@ -27,44 +27,41 @@ async def test_simple_read(dut, write_data):
     recv_data = await tb.i3c_controller.i3c_read(tb.i3c_target.address, length)
 
     # Dump memory for more insight
-    if recv_data != bytearray(write_data):
+    if recv_data != write_data:
         tb.log.info("Dump target memory")
         tb.i3c_target._mem.dump()
         raise I3cExecError(
-            f"Written {[hex(_) for _ in write_data]} to the target device but read {recv_data}"
+            f"Written {write_data.hex(' ')} to the target device but read {recv_data.hex(' ')}"
         )
 
 
 @cocotb.test()
 async def test_simple_read_odd_byte(dut):
-    await test_simple_read(dut, [0xA0])
+    await test_simple_read(dut, bytes([0xA0]))
 
 
 @cocotb.test()
 async def test_simple_read_even_byte(dut):
-    await test_simple_read(dut, [0xAA])
+    await test_simple_read(dut, bytes([0xAA]))
 
 
 @cocotb.test()
 async def test_simple_read_zero(dut):
-    await test_simple_read(dut, [0x00 for _ in range(42)])
+    await test_simple_read(dut, bytes(42))
 
 
 @cocotb.test()
 async def test_simple_read_all_bits(dut):
-    await test_simple_read(dut, [0xFF for _ in range(42)])
+    await test_simple_read(dut, b"\xff" * 42)
 
 
 @cocotb.test()
 async def test_simple_read_long(dut):
-    await test_simple_read(
-        dut,
-        [0x00, 0xBB, 0x00, 0x0C, 0xC0, 0x00, 0x10, 0x01, 0x00, 0x2A, 0xE3, 0xAF, 0xAC, 0xDC, 0x04],
-    )
+    await test_simple_read(dut, bytes.fromhex("00 BB 00 0C C0 00 10 01 00 2A E3 AF AC DC 04"))
 
 
 @cocotb.test()
 async def test_simple_write_randomized(dut):
     data_len = 100
-    data = [randint(0, 255) for _ in range(data_len)]
+    data = randbytes(data_len)
     await test_simple_read(dut, data)
@@ -5,11 +5,11 @@ Copyright (c) 2024 Antmicro <www.antmicro.com>
 SPDX-License-Identifier: Apache-2.0
 """
 
-from random import choice, randint
+from random import choice, randbytes, randint
 
 import cocotb
 from cocotb.triggers import Timer
-from utils import I3cTestbench
+from utils import I3cExecError, I3cTestbench
 
 from cocotbext_i3c.i3c_controller import I3cXferMode
 
@@ -78,12 +78,14 @@ async def test_simple_write_followed_by_read(dut, address, issued_data):
 
     await Timer(100, "ns")
 
-    await tb.i3c_controller.i3c_write(address, issued_data)
+    expected = bytes(issued_data)
+
+    await tb.i3c_controller.i3c_write(address, expected)
     recv_data = await tb.i3c_controller.i3c_read(address, 1)
 
-    assert recv_data == bytearray(
-        issued_data
-    ), f"Written {[hex(_) for _ in issued_data]} to the target device but read {recv_data}"
+    assert (
+        recv_data == expected
+    ), f"Written {expected.hex(' ')} to the target device but read {recv_data.hex(' ')}"
 
 
 @cocotb.test()
@@ -106,19 +108,20 @@ async def test_read_write_seq(dut, target_address, test_seq):
         * second is a` list of bytes` to be written.
     """
     tb = I3cTestbench(dut, tgt_address=target_address)
+    test_seq = [(addr, bytes(data)) for addr, data in test_seq]
 
     await Timer(100, "ns")
 
     for addr, data in test_seq:
         await tb.i3c_controller.i3c_write(addr, data, stop=False)
         recv_data = await tb.i3c_controller.i3c_read(addr, len(data), stop=False)
-        # Dump memory
-        tb.log.info("Dump target memory")
-        tb.i3c_target._mem.dump()
-        if addr == target_address:
-            assert recv_data == bytearray(
-                data
-            ), f"Written {[hex(_) for _ in data]} to the target device but read {recv_data}"
+        # Dump memory for more insight
+        if addr == target_address and recv_data != data:
+            tb.log.info("Dump target memory")
+            tb.i3c_target._mem.dump()
+            raise I3cExecError(
+                f"Written {data.hex(' ')} to the target device but read {recv_data.hex(' ')}"
+            )
 
     await tb.i3c_controller.send_stop()
 
@@ -143,5 +146,5 @@ async def test_read_write_seq_randomized(dut):
     data_len = 100
     devices_num = 4
     devices = [randint(0x10, 0xE0) for _ in range(devices_num)]
-    seq = [(choice(devices), [randint(0, 255)]) for _ in range(data_len)]
+    seq = [(choice(devices), randbytes(1)) for _ in range(data_len)]
     await test_read_write_seq(dut, choice(devices), seq)
@@ -31,8 +31,7 @@ async def test_recovery(dut):
     command = I3cRecoveryInterface.Command.PROT_CAP
     data = [0x24, 0x25, 0x26]
 
-    force_pec_error = True
-    for force_pec_error in [False, True]:
+    for force_pec_error in (False, True):
         await rec_if.command_write(address, command, data, force_pec_error)
         await rec_if.command_read(address, command, force_pec_error)
 
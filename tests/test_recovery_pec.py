@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+
+"""
+Copyright (c) 2024 Antmicro <www.antmicro.com>
+SPDX-License-Identifier: Apache-2.0
+
+Plain pytest checks of the recovery interface PEC, no simulator required:
+    pytest tests/test_recovery_pec.py
+"""
+
+import random
+
+import crc
+
+from cocotbext_i3c.i3c_recovery_interface import I3cRecoveryInterface
+
+
+def test_pec_matches_crc_calculator():
+    """
+    Compares the lookup table based PEC against `crc.Calculator` configured with
+    `I3cRecoveryInterface.CRC_CONFIG` on random recovery frames.
+    """
+    calculator = crc.Calculator(I3cRecoveryInterface.CRC_CONFIG)
+    rng = random.Random(0)
+
+    for _ in range(200):
+        addr_header = rng.randrange(0x80) << 1 | rng.randrange(2)
+        xfer = rng.randbytes(rng.randrange(260))
+        expected = calculator.checksum(bytes([addr_header]) + xfer)
+        assert I3cRecoveryInterface._pec(addr_header, xfer) == expected
@@ -1,5 +1,4 @@
 import cocotb
-from cocotb.triggers import Timer
 from utils import I3cTestbench
 
 from cocotbext_i3c.common import I3cTargetResetAction
@@ -13,8 +12,6 @@ async def test_simple_broadcast_default_target_reset(dut):
     # Should send a target reset pattern with no configuration
     await tb.i3c_controller.target_reset()
 
-    await Timer(500, "ns")
-
 
 @cocotb.test()
 async def test_simple_broadcast_target_reset(dut):
@@ -24,8 +21,6 @@ async def test_simple_broadcast_target_reset(dut):
     # Should broadcast configuration and send trarget reset pattern
     await tb.i3c_controller.target_reset(reset_actions=I3cTargetResetAction.RESET_PERIPHERAL_ONLY)
 
-    await Timer(500, "ns")
-
 
 @cocotb.test()
 async def test_multiple_direct_target_reset(dut):
@@ -41,5 +36,3 @@ async def test_multiple_direct_target_reset(dut):
             (0x22, I3cTargetResetAction.RESET_WHOLE_TARGET),
         ]
     )
-
-    await Timer(500, "ns")
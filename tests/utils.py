@@ -1,10 +1,14 @@
 #!/usr/bin/env python
 
 import logging
+import os
 
 from cocotbext_i3c.i3c_controller import I3cController
 from cocotbext_i3c.i3c_target import I3CTarget
 
+_LOG = logging.getLogger("cocotb.tb")
+_LOG.setLevel(os.environ.get("COCOTBEXT_I3C_LOG", "INFO"))
+
 
 class I3cExecError(Exception):
     pass
@@ -14,8 +18,7 @@ class I3cTestbench:
     def __init__(self, dut, tgt_address=0x50):
         self.dut = dut
 
-        self.log = logging.getLogger("cocotb.tb")
-        self.log.setLevel(logging.DEBUG)
+        self.log = _LOG
 
         self.i3c_target = I3CTarget(
             sda_i=dut.sda_o,